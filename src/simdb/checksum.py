@@ -2,6 +2,9 @@ import hashlib
 
 from .uri import URI
 
+CHUNK_SIZE = 1024 * 1024
+"""Size of the blocks read from disk when computing file checksums."""
+
 
 def sha1_checksum(uri: URI) -> str:
     """Generate a SHA1 checksum from the given file.
@@ -20,8 +23,11 @@ def sha1_checksum(uri: URI) -> str:
     if not path.is_file():
         raise ValueError("File appears to be a directory")
 
-    sha1 = hashlib.sha1()
     with path.open("rb") as file:
-        for chunk in iter(lambda: file.read(4096), b""):
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+ reads into a reused buffer and hashes without the GIL
+            return hashlib.file_digest(file, "sha1").hexdigest()
+        sha1 = hashlib.sha1()
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
             sha1.update(chunk)
     return sha1.hexdigest()
@@ -4,6 +4,7 @@ import hashlib
 import io
 import itertools
 import json
+import math
 import os
 import pickle
 import shutil
@@ -675,16 +676,20 @@ class RemoteAPI:
     ):
         msg = f"Uploading file {path} "
         print(msg, file=out_stream, end="")
+        # An empty file is still sent as a single empty chunk
+        total_chunks = max(1, math.ceil(path.stat().st_size / chunk_size))
         num_chunks = 0
         for chunk_index, chunk in enumerate(
             _read_bytes_in_chunks(path, compressed=True, chunk_size=chunk_size)
         ):
             print(".", file=out_stream, end="", flush=True)
-            self._send_chunk(chunk_index, chunk, chunk_size, uuid, file_type, sim_data)
+            self._send_chunk(
+                chunk_index, total_chunks, chunk, chunk_size, uuid, file_type, sim_data
+            )
             num_chunks += 1
         if num_chunks == 0:
             # empty file
-            self._send_chunk(0, b"", chunk_size, uuid, file_type, sim_data)
+            self._send_chunk(0, 1, b"", chunk_size, uuid, file_type, sim_data)
         if type == DataObject.Type.FILE:
             self.post(
                 "files",
@@ -711,6 +716,7 @@ class RemoteAPI:
     def _send_chunk(
         self,
         chunk_index: int,
+        num_chunks: int,
         chunk: bytes,
         chunk_size: int,
         uuid: uuid.UUID,
@@ -720,7 +726,13 @@ class RemoteAPI:
         data = {
             "simulation": sim_data,
             "file_type": file_type,
-            "chunk_info": {uuid.hex: {"chunk_size": chunk_size, "chunk": chunk_index}},
+            "chunk_info": {
+                uuid.hex: {
+                    "chunk_size": chunk_size,
+                    "chunk": chunk_index,
+                    "num_chunks": num_chunks,
+                }
+            },
         }
         files: List[Tuple[str, Tuple[str, bytes, str]]] = [
             (
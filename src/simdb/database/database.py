@@ -202,28 +202,21 @@ class Database:
         else:
             return query.count(), list(data.values())
 
-    def _find_simulation(self, sim_ref: str) -> "Simulation":
+    def _find_simulation(self, sim_ref: str, load_meta: bool = True) -> "Simulation":
+        query = self.session.query(Simulation)
+        if load_meta:
+            query = query.options(joinedload(Simulation.meta))
         try:
             sim_uuid = uuid.UUID(sim_ref)
-            simulation = (
-                self.session.query(Simulation)
-                .options(joinedload(Simulation.meta))
-                .filter_by(uuid=sim_uuid)
-                .one_or_none()
-            )
+            simulation = query.filter_by(uuid=sim_uuid).one_or_none()
         except ValueError:
             try:
-                simulation = (
-                    self.session.query(Simulation)
-                    .options(joinedload(Simulation.meta))
-                    .filter(
-                        sql_or(
-                            sql_cast(Simulation.uuid, Text).startswith(sim_ref),
-                            Simulation.alias == sim_ref,
-                        )
+                simulation = query.filter(
+                    sql_or(
+                        sql_cast(Simulation.uuid, Text).startswith(sim_ref),
+                        Simulation.alias == sim_ref,
                     )
-                    .one_or_none()
-                )
+                ).one_or_none()
             except SQLAlchemyError:
                 simulation = None
             if not simulation:
@@ -618,12 +611,12 @@ class Database:
         return [m.value for m in simulation.meta if m.element == name]
 
     def add_watcher(self, sim_ref: str, watcher: "Watcher"):
-        sim = self._find_simulation(sim_ref)
+        sim = self._find_simulation(sim_ref, load_meta=False)
         sim.watchers.append(watcher)
         self.session.commit()
 
     def remove_watcher(self, sim_ref: str, username: str):
-        sim = self._find_simulation(sim_ref)
+        sim = self._find_simulation(sim_ref, load_meta=False)
         watchers = [w for w in sim.watchers if w.username == username]
         if not watchers:
             raise DatabaseError(f"Watcher not found for simulation {sim_ref}.")
@@ -632,7 +625,8 @@ class Database:
         self.session.commit()
 
     def list_watchers(self, sim_ref: str) -> List["Watcher"]:
-        return self._find_simulation(sim_ref).watchers
+        # The simulation's metadata is not needed to list its watchers
+        return self._find_simulation(sim_ref, load_meta=False).watchers
 
     def list_metadata_keys(self) -> List[dict]:
         if self.engine.dialect.name == "postgresql":
@@ -699,6 +693,30 @@ class Database:
             query = self.session.query(Simulation.alias)
             return [alias for (alias,) in query.all()]
 
+    def next_alias_id(self, prefix: str) -> int:
+        """
+        Get the next free numeric suffix for aliases starting with the given prefix.
+
+        Only the aliases starting with the prefix are fetched from the database, and
+        only their alias column.
+
+        :param prefix: The alias prefix, i.e. "name-" or "name#".
+        :return: One more than the largest numeric suffix in use, or 1 if none are.
+        """
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = self.session.query(Simulation.alias).filter(
+            Simulation.alias.like(escaped + "%", escape="\\")
+        )
+        largest = 0
+        for (alias,) in query.yield_per(1000):
+            # LIKE is case-insensitive in some databases (i.e. SQLite) so check again
+            if not alias.startswith(prefix):
+                continue
+            suffix = alias[len(prefix) :]
+            if suffix.isascii() and suffix.isdigit():
+                largest = max(largest, int(suffix))
+        return largest + 1
+
 
 def get_local_db(config: Config) -> Database:
     db_file = Path(
@@ -1,6 +1,7 @@
 import hashlib
 from pathlib import Path
 
+from simdb.checksum import CHUNK_SIZE
 from simdb.uri import URI
 
 from .utils import imas_files, list_idss, open_imas
@@ -28,6 +29,6 @@ def checksum(uri: URI, ids_list: list) -> str:
                 and ids_name[0] not in ids_list
             ):
                 continue
-            for chunk in iter(lambda: file.read(4096), b""):
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
                 sha1.update(chunk)
     return sha1.hexdigest()
@@ -42,7 +42,9 @@ class CustomEncoder(json.JSONEncoder):
 
     def default(self, o: Any) -> Any:
         if isinstance(o, np.ndarray):
-            encoded_bytes = base64.b64encode(o.data).decode()
+            # Encode straight from the array buffer, only copying arrays which are not
+            # already contiguous in memory
+            encoded_bytes = base64.b64encode(np.ascontiguousarray(o).data).decode()
             return {
                 "_type": "numpy.ndarray",
                 "dtype": o.dtype.name,
@@ -9,6 +9,7 @@ from flask_restx import Resource
 from simdb import __version__
 from simdb.database import Database
 from simdb.remote.core.auth import AuthenticationError, User, requires_auth
+from simdb.remote.core.cache import cache, cache_key
 from simdb.remote.core.typing import current_app
 from simdb.validation.validator import Validator
 
@@ -64,8 +65,23 @@ def register(api, version, namespaces):
 
     @blueprint.teardown_request
     def remove_db_session(_error):
-        if current_app.db:
-            current_app.db.remove()
+        db = getattr(current_app, "db", None)
+        if db is not None:
+            db.remove()
+
+    @blueprint.after_request
+    def add_etag(response: Response) -> Response:
+        # Tag complete GET responses so clients can revalidate them with
+        # If-None-Match and receive a 304 instead of the body again
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.is_sequence
+            and not response.direct_passthrough
+        ):
+            response.add_etag()
+            response.make_conditional(request)
+        return response
 
     @api.errorhandler(AuthenticationError)
     def handle_authentication_error(err: Exception):
@@ -74,6 +90,7 @@ def register(api, version, namespaces):
     @api.route("/")
     class Index(Resource):
         @api.doc(security=[])
+        @cache.cached(key_prefix=cache_key)  # type: ignore[invalid-argument-type]
         def get(self):
             return jsonify(
                 {
@@ -106,10 +123,10 @@ def register(api, version, namespaces):
             )
             if not isinstance(lifetime, int):
                 return error("Token lifetime is not valid")
+            now = datetime.datetime.now(datetime.timezone.utc)
             payload = {
-                "exp": datetime.datetime.now(datetime.timezone.utc)
-                + datetime.timedelta(days=lifetime),
-                "iat": datetime.datetime.now(datetime.timezone.utc),
+                "exp": now + datetime.timedelta(days=lifetime),
+                "iat": now,
                 "sub": auth.username,
                 "email": user.email,
             }
@@ -124,6 +141,7 @@ def register(api, version, namespaces):
     @api.route("/validation_schema")
     class ValidationSchema(Resource):
         @requires_auth()
+        @cache.cached(key_prefix=cache_key)  # type: ignore[invalid-argument-type]
         def get(self, user: User):
             config = current_app.simdb_config
             return jsonify(Validator.validation_schemas(config, None))
@@ -131,6 +149,7 @@ def register(api, version, namespaces):
     @api.route("/upload_options")
     class UploadOptions(Resource):
         @requires_auth()
+        @cache.cached(key_prefix=cache_key)  # type: ignore[invalid-argument-type]
         def get(self, user: User):
             config = current_app.simdb_config
             options = {
@@ -1,11 +1,17 @@
-import gzip
+import contextlib
+import hashlib
 import json
+import os
+import shutil
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, cast
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, cast
 
 import magic
-from flask import Response, jsonify, request, send_file, stream_with_context
+from flask import Response, jsonify, request, send_file
 from flask_restx import Namespace, Resource
 from werkzeug.datastructures import FileStorage
 
@@ -18,33 +24,120 @@ from simdb.json import CustomDecoder
 from simdb.remote.core.auth import User, requires_auth
 from simdb.remote.core.errors import error
 from simdb.remote.core.path import find_common_root, secure_path
+from simdb.remote.core.streaming import stream_json_array
 from simdb.remote.core.typing import current_app
 from simdb.uri import URI
 
+try:
+    # Use the ISA-L accelerated gzip decoder if available
+    from isal.igzip import IGzipFile as GzipFile
+except ImportError:
+    from gzip import GzipFile
+
 api = Namespace("files", path="/")
 
+COPY_BUFSIZE = 1024 * 1024
+MAX_VERIFY_WORKERS = 8
+
+
+class _StagedChecksums:
+    """
+    SHA-1 checksums of staged files computed while their chunks are written, so that
+    verification does not need to read the files back from disk.
+
+    Only uploads whose chunks arrive in order at this process are tracked; anything
+    else is dropped and the checksum is computed from the staged file instead. The
+    size and modification time of the file are recorded with every entry, so that a
+    chunk written by another process (e.g. a retried upload) invalidates it.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: OrderedDict[Path, Tuple[int, Any, Tuple[int, int]]] = (
+            OrderedDict()
+        )
+        self._finished: OrderedDict[Path, Tuple[str, Tuple[int, int]]] = OrderedDict()
+
+    @staticmethod
+    def _put(entries: OrderedDict, path: Path, value: Any) -> None:
+        entries[path] = value
+        entries.move_to_end(path)
+        while len(entries) > _StagedChecksums.MAX_ENTRIES:
+            entries.popitem(last=False)
+
+    @staticmethod
+    def _stat(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def resume(self, path: Path, offset: int) -> Optional[Any]:
+        """Return the running hash for a chunk written at offset, if it is in order."""
+        with self._lock:
+            self._finished.pop(path, None)
+            running = self._running.pop(path, None)
+        if offset == 0:
+            return hashlib.sha1()
+        if running is None or running[0] != offset:
+            return None
+        _, hasher, stat = running
+        try:
+            unchanged = self._stat(path) == stat
+        except OSError:
+            return None
+        return hasher if unchanged else None
+
+    def suspend(self, path: Path, offset: int, hasher: Any) -> None:
+        stat = self._stat(path)
+        with self._lock:
+            self._put(self._running, path, (offset, hasher, stat))
+
+    def finish(self, path: Path, hasher: Any) -> None:
+        stat = self._stat(path)
+        with self._lock:
+            self._put(self._finished, path, (hasher.hexdigest(), stat))
+
+    def pop(self, path: Path) -> Optional[str]:
+        """Return the checksum of the staged file if it is unchanged since upload."""
+        with self._lock:
+            finished = self._finished.pop(path, None)
+        if finished is None:
+            return None
+        checksum, stat = finished
+        if self._stat(path) != stat:
+            return None
+        return checksum
+
+
+_staged_checksums = _StagedChecksums()
+
+
+class _HashingWriter:
+    def __init__(self, file_out: IO[bytes], hasher: Any) -> None:
+        self._file_out = file_out
+        self._hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        return self._file_out.write(data)
+
 
 def _verify_file(
-    sim_uuid: uuid.UUID,
     sim_file: models.File,
     common_root: Optional[Path],
+    staging_dir: Path,
     ids_list: Optional[list] = None,
 ):
-    if current_app.simdb_config.get_option(
-        "development.disable_checksum", default=False
-    ):
-        return
-    staging_dir = (
-        Path(current_app.simdb_config.get_string_option("server.upload_folder"))
-        / sim_uuid.hex
-    )
     if sim_file.type == DataObject.Type.FILE:
         if sim_file.uri.path is None:
             raise ValueError("File does not have an associated path")
         path = secure_path(sim_file.uri.path, common_root, staging_dir)
         if not path.exists():
             raise ValueError(f"file {path} does not exist")
-        checksum = sha1_checksum(URI(scheme="file", path=path))
+        checksum = _staged_checksums.pop(path) or sha1_checksum(
+            URI(scheme="file", path=path)
+        )
         if sim_file.checksum != checksum:
             raise ValueError(f"checksum failed for file {sim_file!r}")
     elif sim_file.type == DataObject.Type.IMAS:
@@ -54,10 +147,6 @@ def _verify_file(
             raise ValueError("The 'path' key is missing in the URI query")
         if common_root == Path("/"):
             uri.query.set("path", str(staging_dir) + path_value)
-        elif common_root is not None and common_root == path_value:
-            uri.query.set(
-                "path", path_value.replace(str(common_root), str(staging_dir))
-            )
         else:
             uri.query.set("path", str(staging_dir))
         checksum = imas_checksum(uri, ids_list or [])
@@ -65,16 +154,79 @@ def _verify_file(
             raise ValueError(f"checksum failed for simulation {sim_file.uri}")
 
 
+def _verify_files(
+    sim_uuid: uuid.UUID,
+    sim_files: List[models.File],
+    common_root: Optional[Path],
+    ids_list: Optional[list] = None,
+):
+    """
+    Verify the checksums of a batch of staged files, resolving the server
+    configuration once for the whole batch.
+    """
+    if current_app.simdb_config.get_option(
+        "development.disable_checksum", default=False
+    ):
+        return
+    staging_dir = (
+        Path(current_app.simdb_config.get_string_option("server.upload_folder"))
+        / sim_uuid.hex
+    )
+    if len(sim_files) <= 1:
+        for sim_file in sim_files:
+            _verify_file(sim_file, common_root, staging_dir, ids_list)
+        return
+
+    # hashlib releases the GIL while hashing so files can be checked concurrently
+    errors = []
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_VERIFY_WORKERS, len(sim_files))
+    ) as executor:
+        futures = [
+            executor.submit(_verify_file, sim_file, common_root, staging_dir, ids_list)
+            for sim_file in sim_files
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except ValueError as err:
+                errors.append(str(err))
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
 def _save_chunked_file(
     file: FileStorage, chunk_info: Dict, path: Path, compressed: bool = True
 ):
-    with path.open("r+b" if path.exists() else "wb") as file_out:
-        file_out.seek(chunk_info["chunk_size"] * chunk_info["chunk"])
+    num_chunks = chunk_info.get("num_chunks")
+    is_last = num_chunks is not None and chunk_info["chunk"] == num_chunks - 1
+    offset = chunk_info["chunk_size"] * chunk_info["chunk"]
+    hasher = _staged_checksums.resume(path, offset)
+    exists = path.exists()
+    with path.open("r+b" if exists else "wb") as file_out:
+        reserve = chunk_info["chunk_size"] * (num_chunks or 0)
+        if not exists and reserve > 0 and hasattr(os, "posix_fallocate"):
+            # Reserve space for the whole file up front so it is laid out in
+            # contiguous extents, not all filesystems support this
+            with contextlib.suppress(OSError):
+                os.posix_fallocate(file_out.fileno(), 0, reserve)
+        file_out.seek(offset)
+        writer = file_out if hasher is None else _HashingWriter(file_out, hasher)
         if compressed:
-            with gzip.GzipFile(fileobj=file.stream, mode="rb") as gz_file:
-                file_out.write(gz_file.read())
+            with GzipFile(fileobj=file.stream, mode="rb") as gz_file:
+                shutil.copyfileobj(gz_file, writer, COPY_BUFSIZE)
+        else:
+            shutil.copyfileobj(file.stream, writer, COPY_BUFSIZE)
+        size = file_out.tell() - offset
+        if is_last:
+            # The last chunk marks the end of the file, drop any preallocated space or
+            # data left over from a previous upload
+            file_out.truncate(offset + size)
+    if hasher is not None:
+        if is_last:
+            _staged_checksums.finish(path, hasher)
         else:
-            file_out.write(file.stream.read())
+            _staged_checksums.suspend(path, offset + size, hasher)
 
 
 def _stage_file_from_chunks(
@@ -90,31 +242,35 @@ def _stage_file_from_chunks(
     )
     staging_dir.mkdir(parents=True, exist_ok=True)
 
+    files_by_uuid = _index_files(sim_files)
     found_files = []
     for file in files:
         if file.filename:
-            file_uuid = uuid.UUID(file.filename)
-            sim_file = next((f for f in sim_files if f.uuid == file_uuid), None)
-            if sim_file is None:
-                raise ValueError(f"file with uuid {file_uuid} not found in simulation")
+            sim_file = _find_file(files_by_uuid, uuid.UUID(file.filename))
             if sim_file.uri.scheme != "file":
                 raise ValueError("cannot upload non file URI")
             found_files.append((file, sim_file))
 
+    created_dirs = {staging_dir}
     for file, sim_file in found_files:
         path = secure_path(sim_file.uri.path, common_root, staging_dir)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.parent not in created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path.parent)
         file_chunk_info = chunk_info.get(
             sim_file.uuid.hex, {"chunk_size": 0, "chunk": 0, "num_chunks": 1}
         )
         _save_chunked_file(file, file_chunk_info, path)
 
 
-def _check_file_is_in_simulation(
-    simulation: models.Simulation, file_uuid: uuid.UUID, file_type: str
+def _index_files(sim_files: Iterable[models.File]) -> Dict[uuid.UUID, models.File]:
+    return {sim_file.uuid: sim_file for sim_file in sim_files}
+
+
+def _find_file(
+    files_by_uuid: Dict[uuid.UUID, models.File], file_uuid: uuid.UUID
 ) -> models.File:
-    sim_files = simulation.inputs if file_type == "input" else simulation.outputs
-    sim_file = next((f for f in sim_files if f.uuid == file_uuid), None)
+    sim_file = files_by_uuid.get(file_uuid)
     if sim_file is None:
         raise ValueError(f"file with uuid {file_uuid} not found in simulation")
     return sim_file
@@ -124,19 +280,24 @@ def _process_simulation_data(data: dict) -> Response:
     simulation = models.Simulation.from_data(data["simulation"])
     sim_file_paths = simulation.file_paths()
     common_root = find_common_root(sim_file_paths)
+    inputs = _index_files(simulation.inputs)
+    outputs = _index_files(simulation.outputs)
     if DataObject.Type(data["obj_type"]) == DataObject.Type.FILE:
-        for file in data["files"]:
-            sim_file = _check_file_is_in_simulation(
-                simulation, uuid.UUID(file["file_uuid"]), file["file_type"]
+        sim_files = [
+            _find_file(
+                inputs if file["file_type"] == "input" else outputs,
+                uuid.UUID(file["file_uuid"]),
             )
-            _verify_file(simulation.uuid, sim_file, common_root)
+            for file in data["files"]
+        ]
+        _verify_files(simulation.uuid, sim_files, common_root)
     elif DataObject.Type(data["obj_type"]) == DataObject.Type.IMAS:
         file = data["files"][0]
-        sim_files = (
-            simulation.inputs if file["file_type"] == "input" else simulation.outputs
+        sim_file = _find_file(
+            inputs if file["file_type"] == "input" else outputs,
+            uuid.UUID(file["file_uuid"]),
         )
-        sim_file = next(f for f in sim_files if f.uuid == uuid.UUID(file["file_uuid"]))
-        _verify_file(simulation.uuid, sim_file, common_root, file["ids_list"])
+        _verify_files(simulation.uuid, [sim_file], common_root, file["ids_list"])
     else:
         raise ValueError("Unsupported object type {}".format(data["obj_type"]))
 
@@ -172,7 +333,7 @@ class FileList(Resource):
     @requires_auth()
     def get(self, user: User):
         files = current_app.db.list_files()
-        return jsonify([file.data() for file in files])
+        return stream_json_array(file.data() for file in files)
 
     @requires_auth()
     def post(self, user: User):
@@ -221,11 +382,9 @@ class NonIMASFileDownload(Resource):
             if file.uri.path is None:
                 return error("File path is not set")
             mimetype = magic.from_file(file.uri.path, mime=True)
-            response = send_file(file.uri.path, mimetype=mimetype)
-            return Response(
-                stream_with_context(response.iter_content()),
-                content_type=response.headers["content-type"],
-            )
+            # send_file hands the open file to the WSGI server's file wrapper (which
+            # uses sendfile under gunicorn) or to the proxy if USE_X_SENDFILE is set
+            return send_file(file.uri.path, mimetype=mimetype)
         except DatabaseError as err:
             return error(str(err))
 
@@ -2,10 +2,11 @@ import contextlib
 import datetime
 import gzip
 import itertools
+import shutil
 import tarfile
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from flask import json as flask_json  # fallback
 from flask import jsonify, request, send_file
@@ -22,7 +23,7 @@ from simdb.remote.core.alias import create_alias_dir
 from simdb.remote.core.auth import User, requires_auth
 from simdb.remote.core.cache import cache, cache_key, clear_cache
 from simdb.remote.core.errors import error
-from simdb.remote.core.path import find_common_root, secure_path
+from simdb.remote.core.path import find_common_root, list_directory, secure_path
 from simdb.remote.core.typing import current_app
 from simdb.uri import URI
 from simdb.validation import ValidationError, Validator
@@ -82,6 +83,8 @@ def _validate(simulation, user) -> Dict:
         )
         if validator_type:
             for output in simulation.outputs:
+                if not validator_type.handles(output.uri):
+                    continue
                 try:
                     validator_type.validate_uri(output.uri, validator_options)
                 except ValidationError as err:
@@ -110,22 +113,13 @@ def _set_alias(alias: str):
     if not character:
         return None, -1
 
-    next_id = 1
-    aliases = current_app.db.get_aliases(alias)
-    for existing_alias in aliases:
-        existing_id = int(existing_alias.split(character)[1])
-        if next_id <= existing_id:
-            next_id = existing_id + 1
+    next_id = current_app.db.next_alias_id(alias)
     alias = f"{alias}{next_id}"
 
     return alias, next_id
 
 
-def _build_trace(sim_id: str) -> Dict[str, Any]:
-    try:
-        simulation = current_app.db.get_simulation(sim_id)
-    except DatabaseError as err:
-        return {"error": str(err)}
+def _trace_data(simulation: models_sim.Simulation) -> Dict[str, Any]:
     data: Dict[str, Any] = cast(Dict[str, Any], simulation.data(recurse=False))
 
     status = simulation.find_meta("status")
@@ -140,10 +134,6 @@ def _build_trace(sim_id: str) -> Dict[str, Any]:
         if status_on:
             data[status_on_name] = status_on[0].value
 
-    replaces = simulation.find_meta("replaces")
-    if replaces:
-        data["replaces"] = _build_trace(replaces[0].value)
-
     replaced_on = simulation.find_meta("replaced_on")
     if replaced_on:
         data["deprecated_on"] = replaced_on[0].value
@@ -155,6 +145,35 @@ def _build_trace(sim_id: str) -> Dict[str, Any]:
     return data
 
 
+def _build_trace(sim_id: Any) -> Dict[str, Any]:
+    # Follow the replaces chain iteratively so that long chains can't exhaust the
+    # recursion limit, and stop if the chain loops back on itself
+    trace: Dict[str, Any] = {}
+    data = trace
+    seen = set()
+    while True:
+        try:
+            simulation = current_app.db.get_simulation(sim_id)
+        except DatabaseError as err:
+            data["error"] = str(err)
+            break
+        if simulation.uuid in seen:
+            data["error"] = f"Replacement chain loops back to simulation {sim_id}"
+            break
+        seen.add(simulation.uuid)
+
+        data.update(_trace_data(simulation))
+
+        replaces = simulation.find_meta("replaces")
+        if not replaces:
+            break
+        sim_id = replaces[0].value
+        data["replaces"] = {}
+        data = data["replaces"]
+
+    return trace
+
+
 def _get_json_aware(force: bool = False, silent: bool = False):
     """
     Parse JSON like Flask's request.get_json, but handle Content-Encoding: gzip.
@@ -236,7 +255,7 @@ class SimulationList(Resource):
     @api.response(200, "Success")
     @api.response(401, "Unauthorized")
     @requires_auth()
-    # @cache.cached(key_prefix=cache_key)
+    @cache.cached(key_prefix=cache_key)  # type: ignore[invalid-argument-type]
     def get(self, user: User):
         limit = int(request.headers.get(SimulationList.LIMIT_HEADER) or 100)
         page = int(request.headers.get(SimulationList.PAGE_HEADER) or 1)
@@ -340,13 +359,17 @@ class SimulationList(Resource):
                     Path(config.get_string_option("server.upload_folder"))
                     / simulation.uuid.hex
                 )
+                # scan each staging directory once rather than stat every file
+                listings: Dict[Path, Set[str]] = {}
 
                 for sim_file in files:
                     if sim_file.uri.scheme == "file":
                         if sim_file.uri.path is None:
                             raise ValueError("Simulation path not set")
                         path = secure_path(sim_file.uri.path, common_root, staging_dir)
-                        if not path.exists():
+                        if path.parent not in listings:
+                            listings[path.parent] = list_directory(path.parent)
+                        if path.name not in listings[path.parent]:
                             raise ValueError(
                                 f"simulation file {sim_file.uuid} not uploaded"
                             )
@@ -482,14 +505,22 @@ class Simulation(Resource):
         try:
             simulation = current_app.db.delete_simulation(sim_id)
             clear_cache()
+            staging_dir = (
+                Path(current_app.simdb_config.get_string_option("server.upload_folder"))
+                / simulation.uuid.hex
+            )
             files = []
             for file in itertools.chain(simulation.inputs, simulation.outputs):
                 if file.uri.scheme == "file":
                     if file.uri.path is None:
                         raise ValueError("File path not set")
                     files.append(f"{file.uuid} ({file.uri.path.name})")
-                    file.uri.path.unlink()
-            if simulation.inputs or simulation.outputs:
+                    # staged files are removed below along with the staging directory
+                    if staging_dir not in file.uri.path.parents:
+                        file.uri.path.unlink()
+            if staging_dir.is_dir():
+                shutil.rmtree(staging_dir)
+            elif simulation.inputs or simulation.outputs:
                 first_file = (
                     simulation.inputs[0] if simulation.inputs else simulation.outputs[0]
                 )
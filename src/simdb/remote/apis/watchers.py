@@ -4,12 +4,16 @@ from flask_restx import Namespace, Resource
 from simdb.database import DatabaseError, models
 from simdb.notifications import Notification
 from simdb.remote.core.auth import User, requires_auth
-from simdb.remote.core.cache import clear_cache
+from simdb.remote.core.cache import cache, clear_cache_scope, scoped_cache_key
 from simdb.remote.core.errors import error
 from simdb.remote.core.typing import current_app
 
 api = Namespace("watchers", path="/")
 
+# Watchers are not included in any other response so changes to them only need to
+# invalidate the cached watcher lists
+WATCHERS_CACHE_SCOPE = "watchers"
+
 
 @api.route("/watchers/<path:sim_id>")
 class Watcher(Resource):
@@ -30,7 +34,7 @@ class Watcher(Resource):
 
             watcher = models.Watcher(username, email, notification)
             current_app.db.add_watcher(sim_id, watcher)
-            clear_cache()
+            clear_cache_scope(WATCHERS_CACHE_SCOPE)
 
             if username != user.name:
                 # TODO: send email to notify user that they have been added as a watcher
@@ -47,12 +51,13 @@ class Watcher(Resource):
             username = data.get("user", user.name)
 
             current_app.db.remove_watcher(sim_id, username)
-            clear_cache()
+            clear_cache_scope(WATCHERS_CACHE_SCOPE)
             return jsonify({"removed": {"simulation": sim_id, "watcher": username}})
         except DatabaseError as err:
             return error(str(err))
 
     @requires_auth()
+    @cache.cached(key_prefix=scoped_cache_key(WATCHERS_CACHE_SCOPE))  # type: ignore[invalid-argument-type]
     def get(self, sim_id: str, user: User):
         try:
             return jsonify(
@@ -12,7 +12,8 @@ from simdb.json import CustomDecoder, CustomEncoder
 
 from .apis import blueprints
 from .core.auth._authenticator import Authenticator
-from .core.cache import cache
+from .core.cache import cache, cache_options
+from .core.request import SimDBRequest
 from .core.typing import SimDBApp
 
 compress = Compress()
@@ -28,15 +29,18 @@ def create_app(
     flask_options = {k.upper(): v for (k, v) in config.get_section("flask", {}).items()}
 
     app = cast(SimDBApp, Flask(__name__))
+    app.request_class = SimDBRequest  # ty: ignore[invalid-assignment]
     CORS(app, resources={r"/*": {"origins": "*"}})
     app.config["TESTING"] = testing
     app.config["DEBUG"] = debug
     app.config["PROFILE"] = profile
     app.json_encoder = cast(Type[JSONEncoder], CustomEncoder)
     app.json_decoder = cast(Type[JSONDecoder], CustomDecoder)
+    # Response key order is not significant, so skip sorting every dict on encode
+    app.config["JSON_SORT_KEYS"] = False
     app.config.from_mapping(flask_options)
     app.simdb_config = config
-    cache.init_app(app)
+    cache.init_app(app, config=cache_options(config))
     compress.init_app(app)
 
     gunicorn_logger = logging.getLogger("gunicorn.error")
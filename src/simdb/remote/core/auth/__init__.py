@@ -1,6 +1,8 @@
 import csv
-from functools import wraps
-from typing import Optional
+import hashlib
+import hmac
+from functools import lru_cache, wraps
+from typing import FrozenSet, Optional, Tuple
 
 from flask import Request, Response, request
 
@@ -63,6 +65,11 @@ def authenticate():
     )
 
 
+@lru_cache(maxsize=64)
+def _role_members(users: str) -> FrozenSet[str]:
+    return frozenset(next(csv.reader([users]), []))
+
+
 def check_role(config: Config, user: User, role: Optional[str]) -> bool:
     """
     This function is called to check if an authenticated user is a member of the
@@ -72,12 +79,63 @@ def check_role(config: Config, user: User, role: Optional[str]) -> bool:
     """
     if role:
         users = config.get_string_option(f"role.{role}.users", default="")
-        reader = csv.reader([users])
-        return any(user.name in row for row in reader)
+        return user.name in _role_members(users)
 
     return True
 
 
+@lru_cache(maxsize=1)
+def _admin_password_digest(admin_password: str) -> bytes:
+    return hashlib.sha256(admin_password.encode()).digest()
+
+
+def _check_admin_password(config: Config, password: Optional[str]) -> bool:
+    """
+    Compare the given password against the configured admin password in constant
+    time. Both are hashed first so that the time taken does not depend on their
+    lengths either.
+    """
+    admin_password = str(config.get_option("server.admin_password"))
+    if password is None:
+        return False
+    return hmac.compare_digest(
+        hashlib.sha256(password.encode()).digest(),
+        _admin_password_digest(admin_password),
+    )
+
+
+@lru_cache(maxsize=8)
+def _authenticator_chain(
+    authentication_type: str,
+) -> Tuple[Tuple[str, Authenticator], ...]:
+    """
+    Resolve the authenticators to try, in order, for the configured authentication
+    type. Token authentication is always tried first.
+
+    Authenticators hold no state so the resolved chain is cached and shared between
+    requests.
+    """
+    authentication_types = authentication_type.lower().split(",")
+    if "token" not in authentication_types:
+        authentication_types = ["token", *authentication_types]
+    return tuple((name, Authenticator.get(name)) for name in authentication_types)
+
+
+@lru_cache(maxsize=8)
+def _credential_headers(authentication_type: str) -> Optional[FrozenSet[str]]:
+    """
+    Collect the request headers that the authenticators for the configured
+    authentication type read their credentials from, or None if any of them can
+    authenticate a request which carries no credentials.
+    """
+    headers = set()
+    for _, authenticator in _authenticator_chain(authentication_type):
+        if authenticator.CredentialHeaders is None:
+            return None
+        headers.update(authenticator.CredentialHeaders)
+    return frozenset(headers)
+
+
 def check_auth(config: Config, request: Request) -> Optional[User]:
     """
     This function is called to check if a request is authenticated.
@@ -86,19 +144,25 @@ def check_auth(config: Config, request: Request) -> Optional[User]:
     username = auth.username if auth is not None else None
     password = auth.password if auth is not None else None
     if username == "admin":
-        if password == config.get_option("server.admin_password"):
+        if _check_admin_password(config, password):
             return User("admin", None)
         else:
             raise AuthenticationError(f"Authentication failed for user {username}")
 
-    authentication_types = (
-        config.get_string_option("authentication.type").lower().split(",")
-    )
-    if "token" not in authentication_types:
-        authentication_types = ["token", *authentication_types]
+    authentication_types = config.get_string_option("authentication.type")
+
+    headers = _credential_headers(authentication_types)
+    if (
+        auth is None
+        and headers is not None
+        and not any(header in request.headers for header in headers)
+    ):
+        # No credentials were sent so there is nothing for the authenticators to check
+        return None
+
+    authenticators = _authenticator_chain(authentication_types)
 
-    for authentication_type in authentication_types:
-        authenticator = Authenticator.get(authentication_type)
+    for authentication_type, authenticator in authenticators:
         try:
             user = authenticator.authenticate(config, request)
             if user is not None:
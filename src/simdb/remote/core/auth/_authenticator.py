@@ -1,5 +1,5 @@
 import abc
-from typing import ClassVar, Dict, Optional, Type
+from typing import ClassVar, Dict, Optional, Tuple, Type
 
 from flask import Request
 
@@ -16,6 +16,9 @@ class Authenticator(abc.ABC):
 
     Authenticators: ClassVar[Dict[str, Type["Authenticator"]]] = {}
     Name: str
+    # Request headers the authenticator reads its credentials from. None means the
+    # authenticator may succeed without any credentials being sent.
+    CredentialHeaders: ClassVar[Optional[Tuple[str, ...]]] = None
 
     @abc.abstractmethod
     def authenticate(
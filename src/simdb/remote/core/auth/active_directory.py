@@ -20,6 +20,7 @@ class ActiveDirectoryAuthenticator(Authenticator):
     """
 
     Name = "ActiveDirectory"
+    CredentialHeaders = ("Authorization",)
 
     def authenticate(self, config: Config, request: Request) -> Optional[User]:
         try:
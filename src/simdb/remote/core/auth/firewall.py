@@ -30,10 +30,12 @@ class FirewallAuthenticator(Authenticator):
                 "Firewall auth enabled but authentication.firewall_email not defined"
             )
 
-        if firewall_user not in request.headers:
+        user = request.headers.get(firewall_user)
+        if user is None:
             raise AuthenticationError(f"Header {firewall_user} not found")
 
-        if firewall_email not in request.headers:
+        email = request.headers.get(firewall_email)
+        if email is None:
             raise AuthenticationError(f"Header {firewall_email} not found")
 
-        return User(request.headers[firewall_user], request.headers[firewall_email])
+        return User(user, email)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 from flask import Request
@@ -10,9 +11,19 @@ from ._exceptions import AuthenticationError
 from ._user import User
 
 
+@lru_cache(maxsize=8)
+def _openid_client(server_url: str, realm_name: str, client_id: str) -> KeycloakOpenID:
+    # The client holds an HTTP session and the realm's public keys, so share it
+    # between requests rather than building a new one for each token
+    return KeycloakOpenID(
+        server_url=server_url, client_id=client_id, realm_name=realm_name
+    )
+
+
 class KeyCloakAuthenticator(Authenticator):
     TOKEN_HEADER_NAME = "KeyCloak-Token"
     Name = "KeyCloak"
+    CredentialHeaders = (TOKEN_HEADER_NAME,)
 
     def authenticate(self, config: Config, request: Request) -> Optional[User]:
         sever_url = config.get_string_option("authentication.sever_url")
@@ -22,9 +33,7 @@ class KeyCloakAuthenticator(Authenticator):
         token = request.headers.get(KeyCloakAuthenticator.TOKEN_HEADER_NAME, "")
 
         try:
-            oid = KeycloakOpenID(
-                server_url=sever_url, client_id=realm_name, realm_name=client_id
-            )
+            oid = _openid_client(sever_url, realm_name, client_id)
             decoded = oid.decode_token(token)
 
             name = decoded.get("name", None)
@@ -1,6 +1,10 @@
-from typing import Optional
+import contextlib
+import threading
+from typing import Any, Optional, Tuple
 
 import ldap
+import ldap.dn
+import ldap.filter
 from flask import Request
 
 from simdb.config import Config
@@ -9,6 +13,42 @@ from ._authenticator import Authenticator
 from ._exceptions import AuthenticationError
 from ._user import User
 
+# Connections bound as the query user are kept per thread and reused between requests,
+# only the bind with the user's own credentials needs a new connection each time
+_local = threading.local()
+
+
+def _connect(ldap_host: str) -> Any:
+    try:
+        return ldap.initialize(ldap_host)
+    except ldap.LDAPError as err:  # ty: ignore[unresolved-attribute]
+        raise AuthenticationError("failed to connect to ldap server") from err
+
+
+def _drop_query_connection() -> None:
+    cached = getattr(_local, "query_connection", None)
+    _local.query_connection = None
+    if cached is not None:
+        with contextlib.suppress(ldap.LDAPError):  # ty: ignore[unresolved-attribute]
+            cached[1].unbind_s()
+
+
+def _query_connection(ldap_host: str, query_user: str, query_password: str) -> Any:
+    key: Tuple[str, str, str] = (ldap_host, query_user, query_password)
+    cached = getattr(_local, "query_connection", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    _drop_query_connection()
+    conn = _connect(ldap_host)
+    try:
+        conn.simple_bind_s(query_user, query_password)
+    except ldap.INVALID_CREDENTIALS as err:  # ty: ignore[unresolved-attribute]
+        raise AuthenticationError(
+            "failed to bind to LDAP server for user query"
+        ) from err
+    _local.query_connection = (key, conn)
+    return conn
+
 
 class LdapAuthenticator(Authenticator):
     """
@@ -26,14 +66,9 @@ class LdapAuthenticator(Authenticator):
     """
 
     Name = "LDAP"
+    CredentialHeaders = ("Authorization",)
 
     def authenticate(self, config: Config, request: Request) -> Optional[User]:
-        ldap_host = config.get_option("authentication.ldap_server")
-        try:
-            conn = ldap.initialize(ldap_host)
-        except ldap.LDAPError as err:  # ty: ignore[unresolved-attribute]
-            raise AuthenticationError("failed to connect to ldap server") from err
-
         auth = request.authorization
         if not auth:
             return None
@@ -41,33 +76,24 @@ class LdapAuthenticator(Authenticator):
         username = auth.username
         password = auth.password
 
+        ldap_host = config.get_string_option("authentication.ldap_server")
+        conn = _connect(ldap_host)
+
         ldap_bind: str = config.get_string_option("authentication.ldap_bind")
         try:
-            conn.simple_bind_s(ldap_bind.format(username=username), password)
+            conn.simple_bind_s(
+                ldap_bind.format(username=ldap.dn.escape_dn_chars(username)), password
+            )
         except ldap.INVALID_CREDENTIALS:  # ty: ignore[unresolved-attribute]
             return None
 
-        ldap_query_user = config.get_option(
+        ldap_query_user = config.get_string_option(
             "authentication.ldap_query_user", default=None
         )
-        ldap_query_password = config.get_option(
+        ldap_query_password = config.get_string_option(
             "authentication.ldap_query_password", default=None
         )
 
-        if ldap_query_user is not None:
-            conn.unbind_s()
-            try:
-                conn = ldap.initialize(ldap_host)
-            except ldap.LDAPError as err:  # ty: ignore[unresolved-attribute]
-                raise AuthenticationError("failed to connect to ldap server") from err
-
-            try:
-                conn.simple_bind_s(ldap_query_user, ldap_query_password)
-            except ldap.INVALID_CREDENTIALS as err:  # ty: ignore[unresolved-attribute]
-                raise AuthenticationError(
-                    "failed to bind to LDAP server for user query"
-                ) from err
-
         ldap_query_base = config.get_option("authentication.ldap_query_base")
         ldap_query_filter = str(config.get_option("authentication.ldap_query_filter"))
         ldap_query_uid = config.get_option(
@@ -77,11 +103,35 @@ class LdapAuthenticator(Authenticator):
             "authentication.ldap_query_mail", default="mail"
         )
 
-        results = conn.search_s(
-            ldap_query_base,
-            ldap.SCOPE_SUBTREE,  # ty: ignore[unresolved-attribute]
-            ldap_query_filter.format(username=username),
-        )
+        def search(conn):
+            return conn.search_s(
+                ldap_query_base,
+                ldap.SCOPE_SUBTREE,  # ty: ignore[unresolved-attribute]
+                ldap_query_filter.format(
+                    username=ldap.filter.escape_filter_chars(username)
+                ),
+            )
+
+        if ldap_query_user is not None:
+            conn.unbind_s()
+            query_conn = _query_connection(
+                ldap_host, ldap_query_user, ldap_query_password
+            )
+            try:
+                results = search(query_conn)
+            except (ldap.SERVER_DOWN, ldap.CONNECT_ERROR):  # ty: ignore[unresolved-attribute]
+                # The cached connection has gone stale, reconnect and try once more
+                _drop_query_connection()
+                query_conn = _query_connection(
+                    ldap_host, ldap_query_user, ldap_query_password
+                )
+                results = search(query_conn)
+        else:
+            try:
+                results = search(conn)
+            finally:
+                conn.unbind_s()
+
         try:
             user = results[0][1][ldap_query_uid][0].decode()
             mail = results[0][1][ldap_query_mail][0].decode()
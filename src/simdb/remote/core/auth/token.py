@@ -1,4 +1,3 @@
-import datetime
 from typing import Optional
 
 import jwt
@@ -11,34 +10,33 @@ from ._authenticator import Authenticator
 from ._exceptions import AuthenticationError
 from ._user import User
 
+# Signature, expiry and required claims are all checked by PyJWT. The decoder is
+# created once so its options don't need merging again for every request.
+_decoder = jwt.PyJWT(options={"require": ["exp", "sub"]})
+
 
 class TokenAuthenticator(Authenticator):
     TOKEN_HEADER_NAME: str = "Authorization"
+    TOKEN_PREFIX: str = "JWT-Token "
 
     Name = "Token"
+    CredentialHeaders = (TOKEN_HEADER_NAME,)
 
     def authenticate(self, config: Config, request: Request) -> Optional[User]:
         try:
-            token = request.headers.get(TokenAuthenticator.TOKEN_HEADER_NAME, "")
-
-            (name, token) = token.split() if token else (None, "")
+            header = request.headers.get(TokenAuthenticator.TOKEN_HEADER_NAME, "")
 
-            if name != "JWT-Token":
+            if not header.startswith(TokenAuthenticator.TOKEN_PREFIX):
                 raise AuthenticationError("Invalid token")
 
-            payload = jwt.decode(
-                token.strip(),
+            payload = _decoder.decode(
+                header[len(TokenAuthenticator.TOKEN_PREFIX) :].strip(),
                 current_app.config.get("SECRET_KEY", ""),
                 algorithms=["HS256"],
             )
+            return User(payload["sub"], payload["email"])
 
-            expires = datetime.datetime.fromtimestamp(
-                payload["exp"], tz=datetime.timezone.utc
-            )
-            if datetime.datetime.now(datetime.timezone.utc) < expires:
-                return User(payload["sub"], payload["email"])
-            else:
-                raise AuthenticationError("Token expired")
-
+        except jwt.exceptions.ExpiredSignatureError as ex:
+            raise AuthenticationError("Token expired") from ex
         except (IndexError, KeyError, jwt.exceptions.PyJWTError) as ex:
             raise AuthenticationError("Invalid token") from ex
@@ -1,28 +1,77 @@
 import contextlib
+import uuid
+from typing import Any, Callable, Dict
 
 from flask import request
 from flask_caching import Cache
 
 from simdb.config import Config
 
-config = Config("app.cfg")
-config.load()
-cache_options = {
-    "CACHE_" + k.upper(): v for (k, v) in config.get_section("cache", {}).items()
-}
+cache = Cache()
 
-cache = Cache(config=cache_options)
+
+def cache_options(config: Config) -> Dict[str, Any]:
+    """
+    Convert the [cache] section of the server configuration into Flask-Caching
+    options, i.e. type becomes CACHE_TYPE.
+    """
+    return {
+        "CACHE_" + k.upper(): v for (k, v) in config.get_section("cache", {}).items()
+    }
+
+
+_HEADER_PREFIX = "HTTP_SIMDB_"
 
 
 def cache_key(*args, **kwargs) -> str:
-    headers = []
-    for key, value in request.headers.items():
-        if "simdb-" in key.lower():
-            headers.append(f"{key.lower()}:{value}")
-    return request.url + "?" + "&".join(headers)
+    # Read the WSGI environ directly rather than going through request.headers which
+    # converts every header name. The headers are sorted so that the key does not
+    # depend on the order the client sent them in.
+    headers = sorted(
+        (key, value)
+        for key, value in request.environ.items()
+        if key.startswith(_HEADER_PREFIX)
+    )
+    if not headers:
+        return request.url
+    query = "&".join(
+        f"{key[5:].lower().replace('_', '-')}:{value}" for key, value in headers
+    )
+    return f"{request.url}?{query}"
 
 
 def clear_cache():
     # If /tmp has been cleared by the system then we should ignore this exception
     with contextlib.suppress(FileNotFoundError):
         cache.clear()
+
+
+def _scope_generation(scope: str) -> str:
+    key = f"{scope}:generation"
+    generation = cache.get(key)
+    if generation is None:
+        # Start a fresh namespace if the generation was never set or has been evicted
+        generation = uuid.uuid4().hex
+        cache.set(key, generation, timeout=0)
+    return generation
+
+
+def scoped_cache_key(scope: str) -> Callable[..., str]:
+    """
+    Create a cache key function for responses which can be invalidated together using
+    clear_cache_scope, without clearing every other cached response.
+
+    :param scope: The name of the group of responses, i.e. "watchers".
+    :return: A function to pass as the key_prefix of cache.cached.
+    """
+
+    def _key(*args, **kwargs) -> str:
+        return f"{scope}:{_scope_generation(scope)}:{cache_key()}"
+
+    return _key
+
+
+def clear_cache_scope(scope: str):
+    # Moving to a new generation orphans the old entries which then expire as normal
+    with contextlib.suppress(FileNotFoundError):
+        cache.set(f"{scope}:generation", uuid.uuid4().hex, timeout=0)
@@ -1,10 +1,18 @@
+import functools
 import os
 from pathlib import Path
-from typing import Collection, Optional
+from typing import Collection, Optional, Set
 
 from werkzeug.utils import secure_filename
 
 
+@functools.lru_cache(maxsize=4096)
+def _secure_filename(name: str) -> str:
+    # the same file names are sanitised on every chunk upload, verification and
+    # ingest so cache the result of the werkzeug regex substitutions
+    return secure_filename(name)
+
+
 def secure_path(
     path: Path, common_root: Optional[Path], staging_dir: Path, is_file=True
 ) -> Path:
@@ -13,7 +21,7 @@ def secure_path(
     else:
         directory = staging_dir / path.parent.relative_to(common_root)
     if is_file:
-        return directory / secure_filename(path.name)
+        return directory / _secure_filename(path.name)
     else:
         return directory
 
@@ -21,3 +29,15 @@ def secure_path(
 def find_common_root(paths: Collection[Path]) -> Optional[Path]:
     common_root = Path(os.path.commonpath(paths)) if len(paths) > 1 else None
     return common_root
+
+
+def list_directory(directory: Path) -> Set[str]:
+    """
+    Return the names of the entries in the given directory using a single scan, or an
+    empty set if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
@@ -0,0 +1,36 @@
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import IO, Optional
+
+from flask import Request
+
+from .typing import current_app
+
+SPOOL_MAX_SIZE = 1024 * 500
+"""Requests up to this size keep their uploaded files in memory."""
+
+
+class SimDBRequest(Request):
+    """
+    Request which writes uploaded files straight to a temporary file in the server
+    upload folder, rather than buffering them in memory or in the system temporary
+    directory (which is often a size limited tmpfs).
+    """
+
+    def _get_file_stream(
+        self,
+        total_content_length: Optional[int],
+        content_type: Optional[str],
+        filename: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ) -> IO[bytes]:
+        if total_content_length is not None and total_content_length <= SPOOL_MAX_SIZE:
+            return BytesIO()
+        upload_folder = current_app.simdb_config.get_string_option(
+            "server.upload_folder", default=None
+        )
+        if upload_folder is None:
+            return tempfile.TemporaryFile("rb+")
+        Path(upload_folder).mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryFile("rb+", dir=upload_folder)
@@ -0,0 +1,25 @@
+from typing import Any, Iterable, Iterator
+
+from flask import Response, json, stream_with_context
+
+
+def _iter_json_array(items: Iterable[Any]) -> Iterator[str]:
+    yield "["
+    separator = ""
+    for item in items:
+        yield separator + json.dumps(item)
+        separator = ","
+    yield "]"
+
+
+def stream_json_array(items: Iterable[Any]) -> Response:
+    """
+    Create a response which serialises the given items as a JSON array one item at a
+    time, so that the whole array never needs to be held in memory.
+
+    :param items: An iterable of JSON serialisable objects.
+    :return: A streamed application/json response.
+    """
+    return Response(
+        stream_with_context(_iter_json_array(items)), mimetype="application/json"
+    )
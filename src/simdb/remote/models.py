@@ -2,8 +2,18 @@
 
 from datetime import datetime as dt
 from datetime import timezone
-from typing import Annotated, Any, Generic, List, Literal, Optional, TypeVar, Union
-from urllib.parse import urlencode
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+)
+from urllib.parse import quote_plus, urlencode
 from uuid import UUID, uuid1
 
 from pydantic import (
@@ -15,10 +25,21 @@ from pydantic import (
     model_validator,
 )
 
-HexUUID = Annotated[UUID, PlainSerializer(lambda x: x.hex, return_type=str)]
+
+def _serialize_hex_uuid(v: UUID) -> str:
+    """Serialize UUID as a hex string."""
+    return v.hex
+
+
+HexUUID = Annotated[UUID, PlainSerializer(_serialize_hex_uuid, return_type=str)]
 """UUID serialized as a hex string."""
 
 
+def _serialize_custom_uuid(v: UUID) -> Dict[str, str]:
+    """Serialize UUID to the CustomUUID format."""
+    return {"_type": "uuid.UUID", "hex": v.hex}
+
+
 def _deserialize_custom_uuid(v: Any) -> UUID:
     """Deserialize CustomUUID format back to UUID."""
     if isinstance(v, UUID):
@@ -31,10 +52,35 @@ def _deserialize_custom_uuid(v: Any) -> UUID:
 CustomUUID = Annotated[
     UUID,
     BeforeValidator(_deserialize_custom_uuid),
-    PlainSerializer(lambda x: {"_type": "uuid.UUID", "hex": x.hex}),
+    PlainSerializer(_serialize_custom_uuid, return_type=Dict[str, str]),
 ]
 """UUID with custom serialization format."""
 
+
+def _deserialize_metadata_value(v: Any) -> Any:
+    """Deserialize a metadata value, converting the CustomUUID format to UUID."""
+    if isinstance(v, dict) and "hex" in v:
+        try:
+            return UUID(hex=v["hex"])
+        except (AttributeError, TypeError, ValueError):
+            return v
+    return v
+
+
+def _serialize_metadata_value(v: Any) -> Any:
+    """Serialize a metadata value, using the CustomUUID format for UUIDs."""
+    if isinstance(v, UUID):
+        return _serialize_custom_uuid(v)
+    return v
+
+
+MetadataValue = Annotated[
+    Any,
+    BeforeValidator(_deserialize_metadata_value),
+    PlainSerializer(_serialize_metadata_value),
+]
+"""Metadata value of any type, with UUIDs in the custom serialization format."""
+
 StatusLiteral = Literal[
     "not validated", "accepted", "failed", "passed", "deprecated", "deleted"
 ]
@@ -71,7 +117,7 @@ class FileData(BaseModel):
     """File type."""
     uri: str
     """URI to the file location."""
-    uuid: CustomUUID = Field(default_factory=lambda: uuid1())
+    uuid: CustomUUID = Field(default_factory=uuid1)
     """Unique identifier for the file."""
     checksum: str
     """Checksum of the file."""
@@ -98,13 +144,17 @@ class FileDataList(RootModel):
         """Allow indexing on the list."""
         return self.root[item]
 
+    def __iter__(self) -> Iterator[FileData]:  # ty: ignore[invalid-method-override]
+        """Iterate over the list items."""
+        return iter(self.root)
+
 
 class MetadataData(BaseModel):
     """Key-value pair for simulation metadata."""
 
     element: str
     """Metadata key/name."""
-    value: Union[CustomUUID, Any]
+    value: MetadataValue
     """Metadata value."""
 
     def as_dict(self) -> dict:
@@ -113,7 +163,7 @@ class MetadataData(BaseModel):
 
     def as_querystring(self) -> str:
         """Convert to URL query string."""
-        return urlencode(self.as_dict())
+        return f"{quote_plus(self.element)}={quote_plus(str(self.value))}"
 
 
 class MetadataPatchData(BaseModel):
@@ -141,6 +191,10 @@ class MetadataDataList(RootModel):
         """Allow indexing on the list."""
         return self.root[item]
 
+    def __iter__(self) -> Iterator[MetadataData]:  # ty: ignore[invalid-method-override]
+        """Iterate over the list items."""
+        return iter(self.root)
+
     def as_dict(self) -> dict:
         """Convert all metadata to dictionary."""
         return {m.element: m.value for m in self.root}
@@ -170,7 +224,7 @@ class SimulationReference(BaseModel):
 class SimulationData(BaseModel):
     """Core simulation data."""
 
-    uuid: CustomUUID = Field(default_factory=lambda: uuid1())
+    uuid: CustomUUID = Field(default_factory=uuid1)
     """Unique identifier of the simulation."""
     alias: Optional[str] = None
     """Human-readable alias."""
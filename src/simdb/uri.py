@@ -14,11 +14,11 @@ class Query:
     Class representing the URI query parameters.
     """
 
-    _args: Dict[str, Optional[str]]
+    __slots__ = ("_args",)
 
     def __init__(self, query: Optional[str]):
         query = "" if query is None else query
-        self._args = {}
+        self._args: Dict[str, Optional[str]] = {}
         for arg in query.split("&"):
             key, *value = arg.split("=")
             if key and value:
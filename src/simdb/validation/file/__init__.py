@@ -1,19 +1,20 @@
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple, Type
 
 from .ids_validator import IdsValidator
 from .validator_base import FileValidatorBase
 
+_FILE_VALIDATORS: Dict[str, Type[FileValidatorBase]] = {
+    "ids_validator": IdsValidator,
+}
+
 
 def find_file_validator(
     name: str, options: dict
 ) -> Tuple[Optional[FileValidatorBase], Optional[object]]:
-    validators = {
-        "ids_validator": IdsValidator,
-    }
-    if name not in validators:
+    if name not in _FILE_VALIDATORS:
         return None, None
 
-    validator = validators[name]()
+    validator = _FILE_VALIDATORS[name]()
     validate_options = validator.configure(options)
     return validator, validate_options
 
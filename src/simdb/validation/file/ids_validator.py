@@ -18,6 +18,8 @@ from .validator_base import FileValidatorBase
 
 
 class IdsValidator(FileValidatorBase):
+    schemes = frozenset({"imas"})
+
     def configure(self, arguments: dict):
         if not imas_validator_available:
             raise RuntimeError(
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import ClassVar, FrozenSet, Optional
 
 from simdb.uri import URI
 
@@ -8,6 +9,16 @@ class FileValidatorBase(ABC):
     Abstract base class for validating a simulation output file.
     """
 
+    schemes: ClassVar[Optional[FrozenSet[str]]] = None
+    """URI schemes of the files this validator checks, or None to check every file."""
+
+    def handles(self, uri: URI) -> bool:
+        """
+        Return whether the given simulation output file should be passed to
+        validate_uri.
+        """
+        return self.schemes is None or uri.scheme in self.schemes
+
     @abstractmethod
     def configure(self, arguments: dict):
         """
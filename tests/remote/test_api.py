@@ -1,23 +1,34 @@
 import base64
 import contextlib
+import gzip
+import hashlib
 import importlib
+import io
+import json
 import os
 import shutil
 import tempfile
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest import mock
 
+import jwt
 import pytest
 
-from simdb.cli.manifest import Manifest
+from simdb.cli.manifest import DataObject, Manifest
 from simdb.config import Config
 from simdb.database.models import Simulation
 
 with contextlib.suppress(ModuleNotFoundError):
+    from werkzeug.datastructures import FileStorage
+
+    from simdb.remote.apis.files import _save_chunked_file
     from simdb.remote.app import create_app
+    from simdb.remote.core.request import SPOOL_MAX_SIZE
 from simdb.remote.models import (
     FileData,
+    FileDataList,
     MetadataData,
     MetadataDataList,
     MetadataDeleteData,
@@ -55,6 +66,7 @@ def client():
     config.set_option("database.type", "sqlite")
     config.set_option("database.file", db_file)
     config.set_option("server.admin_password", TEST_PASSWORD)
+    config.set_option("flask.secret_key", "test-secret")
     config.set_option("server.upload_folder", upload_dir)
     config.set_option("authentication.type", "None")
     config.set_option("server.copy_files", False)
@@ -118,6 +130,28 @@ def test_get_root(client):
     )
 
 
+def test_get_metadata_not_modified(client):
+    """Test GET /v1.2/metadata returns 304 when the client's ETag still matches."""
+    rv = client.get("/v1.2/metadata", headers=HEADERS)
+    assert rv.status_code == 200
+    assert rv.headers["ETag"]
+
+    rv_cached = client.get(
+        "/v1.2/metadata", headers={**HEADERS, "If-None-Match": rv.headers["ETag"]}
+    )
+    assert rv_cached.status_code == 304
+    assert rv_cached.data == b""
+
+
+def test_get_token(client):
+    """Test GET /v1.2/token issues a token valid for the configured lifetime."""
+    rv = client.get("/v1.2/token", headers=HEADERS)
+    assert rv.status_code == 200
+    payload = jwt.decode(rv.json["token"], options={"verify_signature": False})
+    assert payload["sub"] == "admin"
+    assert payload["exp"] - payload["iat"] == 30 * 24 * 60 * 60
+
+
 def test_get_api_root(client):
     rv = client.get("/v1.2", headers=HEADERS)
     assert rv.status_code == 308
@@ -205,6 +239,55 @@ def test_post_simulations_alias_increment_sequence(client):
     assert result.alias == "sequence-2"
 
 
+def test_post_simulations_alias_increment_after_largest_suffix(client):
+    """Test auto-increment uses the largest numeric suffix of existing aliases."""
+    prefix = f"{uuid.uuid4().hex}-"
+    for suffix in ["9", "10", "2", "final"]:
+        rv = post_simulation(client, generate_simulation_data(alias=prefix + suffix))
+        assert rv.status_code == 200
+
+    simulation_data = generate_simulation_data(alias=prefix)
+    rv = post_simulation(client, simulation_data)
+    assert rv.status_code == 200
+
+    rv_get = client.get(
+        f"/v1.2/simulation/{simulation_data.simulation.uuid.hex}", headers=HEADERS
+    )
+    result = SimulationDataResponse.model_validate(rv_get.json)
+    assert result.alias == f"{prefix}11"
+
+
+@pytest.mark.parametrize(
+    ("aliases", "expected"),
+    [
+        (["{prefix}007", "{prefix}10"], 11),
+        (["{prefix}5", "{prefix}\u00b2"], 6),
+        (["{prefix}5", "{name}Xa-99"], 6),
+        (["{prefix}5", "{upper}_A-50"], 6),
+    ],
+)
+def test_post_simulations_alias_increment_matches_prefix_exactly(
+    client, aliases, expected
+):
+    """Test auto-increment only counts plain numeric suffixes of the exact prefix."""
+    name = uuid.uuid4().hex
+    prefix = f"{name}_a-"
+    for alias in aliases:
+        alias = alias.format(prefix=prefix, name=name, upper=name.upper())
+        rv = post_simulation(client, generate_simulation_data(alias=alias))
+        assert rv.status_code == 200
+
+    simulation_data = generate_simulation_data(alias=prefix)
+    rv = post_simulation(client, simulation_data)
+    assert rv.status_code == 200
+
+    rv_get = client.get(
+        f"/v1.2/simulation/{simulation_data.simulation.uuid.hex}", headers=HEADERS
+    )
+    result = SimulationDataResponse.model_validate(rv_get.json)
+    assert result.alias == f"{prefix}{expected}"
+
+
 @pytest.mark.xfail(reason="Alias is required in current API")
 def test_post_simulations_no_alias(client):
     """Test POST endpoint with no alias provided (should use uuid.hex)."""
@@ -319,6 +402,32 @@ def test_post_simulations_with_watcher(client):
     assert uploaded_by_meta[0]["value"] == "watcher-user"
 
 
+def test_get_watchers(client):
+    """Test GET /v1.2/watchers/{simulation_id} lists the simulation's watchers."""
+    simulation_data = generate_simulation_data(alias=f"watched-{uuid.uuid4().hex}")
+    rv = post_simulation(client, simulation_data)
+    assert rv.status_code == 200
+
+    sim_uuid = simulation_data.simulation.uuid.hex
+    # Skip the email deliverability check which needs DNS access
+    with mock.patch("simdb.database.models.watcher.validate_email"):
+        rv = client.post(
+            f"/v1.2/watchers/{sim_uuid}",
+            json={
+                "user": "watcher",
+                "email": "watcher@example.com",
+                "notification": "ALL",
+            },
+            headers=HEADERS,
+        )
+    assert rv.status_code == 200
+
+    for sim_ref in (sim_uuid, simulation_data.simulation.alias):
+        rv = client.get(f"/v1.2/watchers/{sim_ref}", headers=HEADERS)
+        assert rv.status_code == 200
+        assert [watcher["username"] for watcher in rv.json] == ["watcher"]
+
+
 def test_post_simulations_uploaded_by(client):
     """Test POST endpoint with uploaded_by field."""
     """Test POST endpoint with add_watcher set to true."""
@@ -759,6 +868,32 @@ def test_delete_simulation(client):
     assert rv.status_code == 400
 
 
+def test_delete_simulation_removes_staging_dir(client):
+    """Test DELETE /v1.2/simulation/{simulation_id} removes the staged files."""
+    simulation_data = generate_simulation_data()
+    staging_dir = (
+        Path(client.application.simdb_config.get_option("server.upload_folder"))
+        / simulation_data.simulation.uuid.hex
+    )
+    (staging_dir / "outputs").mkdir(parents=True)
+    file_data = generate_simulation_file()
+    file_data.uri = f"file://{staging_dir / 'outputs' / 'data.bin'}"
+    (staging_dir / "outputs" / "data.bin").write_bytes(b"data")
+    simulation_data.simulation.outputs = [file_data]
+
+    rv_post = post_simulation(client, simulation_data)
+    assert rv_post.status_code == 200
+
+    rv = client.delete(
+        f"/v1.2/simulation/{simulation_data.simulation.uuid.hex}",
+        headers=HEADERS,
+    )
+
+    assert rv.status_code == 200
+    assert rv.json["deleted"]["files"] == [f"{file_data.uuid} (data.bin)"]
+    assert not staging_dir.exists()
+
+
 def test_patch_simulation_metadata(client):
     """Test PATCH /v1.2/simulation/metadata/{simulation_id} endpoint."""
     simulation_data = generate_simulation_data(
@@ -869,3 +1004,281 @@ def test_trace_endpoint(client):
     assert trace.replaces.replaces is not None
     assert trace.replaces.replaces.uuid == sim_v1.simulation.uuid
     assert trace.replaces.replaces.replaces is None
+
+
+def test_trace_endpoint_replacement_loop(client):
+    """Test trace endpoint stops when a replacement chain loops back on itself."""
+    sim_uuid = uuid.uuid1()
+    sim_a = generate_simulation_data(
+        alias="trace-loop-a",
+        metadata=[MetadataData(element="replaces", value=sim_uuid.hex)],
+    )
+    assert post_simulation(client, sim_a).status_code == 200
+
+    sim_b = generate_simulation_data(
+        alias="trace-loop-b",
+        uuid=sim_uuid,
+        metadata=[MetadataData(element="replaces", value=sim_a.simulation.uuid.hex)],
+    )
+    assert post_simulation(client, sim_b).status_code == 200
+
+    rv_trace = client.get(f"/v1.2/trace/{sim_uuid.hex}", headers=HEADERS)
+    assert rv_trace.status_code == 200
+
+    trace = rv_trace.json
+    assert trace["alias"] == "trace-loop-b"
+    assert trace["replaces"]["alias"] == "trace-loop-a"
+    assert "loops back" in trace["replaces"]["replaces"]["error"]
+
+
+def upload_chunk(client, simulation_data, file_data, chunk, chunk_info):
+    """Upload a single gzip-compressed chunk of a file to the server."""
+    data = {
+        "simulation": simulation_data.model_dump(mode="json"),
+        "file_type": "input",
+        "chunk_info": {file_data.uuid.hex: chunk_info},
+    }
+    rv = client.post(
+        "/v1.2/files",
+        data={
+            "data": (io.BytesIO(json.dumps(data).encode()), "data"),
+            "files": (io.BytesIO(gzip.compress(chunk)), file_data.uuid.hex),
+        },
+        headers=HEADERS,
+        content_type="multipart/form-data",
+    )
+    assert rv.status_code == 200
+
+
+def upload_file(client, simulation_data, file_data, content, chunk_size):
+    """Upload file content to the server in gzip-compressed chunks."""
+    chunks = [
+        content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+    ] or [b""]
+    for index, chunk in enumerate(chunks):
+        chunk_info = {
+            "chunk_size": chunk_size,
+            "chunk": index,
+            "num_chunks": len(chunks),
+        }
+        upload_chunk(client, simulation_data, file_data, chunk, chunk_info)
+
+
+def verify_files(client, simulation_data, files_data):
+    """Ask the server to verify the checksums of uploaded input files."""
+    return client.post(
+        "/v1.2/files",
+        json={
+            "simulation": simulation_data.model_dump(mode="json"),
+            "obj_type": DataObject.Type.FILE.value,
+            "files": [
+                {"file_type": "input", "file_uuid": file_data.uuid.hex}
+                for file_data in files_data
+            ],
+        },
+        headers=HEADERS,
+    )
+
+
+@pytest.mark.parametrize("size", [0, 100, 2500])
+def test_post_files(client, size):
+    """Test POST /v1.2/files uploads chunks and verifies the staged file."""
+    content = bytes(i % 251 for i in range(size))
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/data.bin"
+    file_data.checksum = hashlib.sha1(content).hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    upload_file(client, simulation_data, file_data, content, chunk_size=1024)
+    rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 200
+
+    upload_dir = Path(
+        client.application.simdb_config.get_option("server.upload_folder")
+    )
+    staged = upload_dir / simulation_data.uuid.hex / "data.bin"
+    assert staged.read_bytes() == content
+
+
+def test_post_files_large_chunk(client):
+    """Test POST /v1.2/files stages chunks too large to be held in memory."""
+    content = os.urandom(SPOOL_MAX_SIZE + 1024)
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/large.bin"
+    file_data.checksum = hashlib.sha1(content).hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    upload_file(client, simulation_data, file_data, content, chunk_size=len(content))
+    rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 200
+
+
+def test_post_files_checksum_mismatch(client):
+    """Test POST /v1.2/files rejects staged files with the wrong checksum."""
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/data.bin"
+    file_data.checksum = hashlib.sha1(b"expected").hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    upload_file(client, simulation_data, file_data, b"actual", chunk_size=1024)
+    rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 400
+    assert "checksum failed" in rv.json["error"]
+
+
+def test_post_files_uses_checksum_computed_during_upload(client):
+    """Test POST /v1.2/files verifies in-order uploads without re-reading them."""
+    content = bytes(i % 251 for i in range(2500))
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/data.bin"
+    file_data.checksum = hashlib.sha1(content).hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    upload_file(client, simulation_data, file_data, content, chunk_size=1024)
+    with mock.patch("simdb.remote.apis.files.sha1_checksum") as sha1_checksum:
+        rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 200
+    sha1_checksum.assert_not_called()
+
+
+def test_post_files_rechecks_modified_staged_file(client):
+    """Test POST /v1.2/files re-reads a staged file changed after upload."""
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/data.bin"
+    file_data.checksum = hashlib.sha1(b"content").hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    upload_file(client, simulation_data, file_data, b"content", chunk_size=1024)
+    upload_dir = Path(
+        client.application.simdb_config.get_option("server.upload_folder")
+    )
+    staged = upload_dir / simulation_data.uuid.hex / "data.bin"
+    staged.write_bytes(b"changed content")
+    rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 400
+    assert "checksum failed" in rv.json["error"]
+
+
+def test_post_files_rechecks_chunk_written_by_another_process(client):
+    """Test POST /v1.2/files re-reads a staged file if a chunk was written elsewhere."""
+    file_data = generate_simulation_file()
+    file_data.uri = "file:///path/to/data.bin"
+    file_data.checksum = hashlib.sha1(b"NEW!tail").hexdigest()
+    simulation_data = generate_simulation_data(inputs=[file_data]).simulation
+
+    chunk_info = {"chunk_size": 4, "num_chunks": 2}
+    upload_chunk(
+        client, simulation_data, file_data, b"OLD!", {**chunk_info, "chunk": 0}
+    )
+    # A retried upload writes the first chunk again through another worker process
+    upload_dir = Path(
+        client.application.simdb_config.get_option("server.upload_folder")
+    )
+    staged = upload_dir / simulation_data.uuid.hex / "data.bin"
+    stat = staged.stat()
+    with staged.open("r+b") as file:
+        file.write(b"NEW!")
+    # Filesystem timestamps may be too coarse to tell the two writes apart
+    os.utime(staged, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    upload_chunk(
+        client, simulation_data, file_data, b"tail", {**chunk_info, "chunk": 1}
+    )
+
+    assert staged.read_bytes() == b"NEW!tail"
+    rv = verify_files(client, simulation_data, [file_data])
+    assert rv.status_code == 200
+
+
+def test_post_files_verifies_multiple_files(client):
+    """Test POST /v1.2/files verifies every listed file and reports failures."""
+    files_data = []
+    contents = [b"first", b"second", b"third"]
+    for index, content in enumerate(contents):
+        file_data = generate_simulation_file()
+        file_data.uri = f"file:///path/to/data/{index}.bin"
+        file_data.checksum = hashlib.sha1(content).hexdigest()
+        files_data.append(file_data)
+    simulation_data = generate_simulation_data(inputs=files_data).simulation
+
+    for file_data, content in zip(files_data, contents):
+        upload_file(client, simulation_data, file_data, content, chunk_size=1024)
+    rv = verify_files(client, simulation_data, files_data)
+    assert rv.status_code == 200
+
+    upload_file(client, simulation_data, files_data[1], b"changed", chunk_size=1024)
+    rv = verify_files(client, simulation_data, files_data)
+    assert rv.status_code == 400
+    assert rv.json["error"].count("checksum failed") == 1
+
+
+def test_get_files(client):
+    """Test GET /v1.2/files returns the files of ingested simulations."""
+    file_data = generate_simulation_file()
+    simulation_data = generate_simulation_data(inputs=[file_data])
+
+    rv_post = post_simulation(client, simulation_data)
+    assert rv_post.status_code == 200
+
+    rv = client.get("/v1.2/files", headers=HEADERS)
+    assert rv.status_code == 200
+    assert rv.mimetype == "application/json"
+    files = [FileData.model_validate(file) for file in rv.json]
+    assert file_data.uuid in [file.uuid for file in files]
+
+
+def test_download_file(client, tmp_path):
+    """Test GET /v1.2/file/download/{file_uuid} returns the file contents."""
+    path = tmp_path / "output.txt"
+    path.write_text("simulation output\n")
+    file_data = generate_simulation_file()
+    file_data.uri = f"file://{path}"
+    simulation_data = generate_simulation_data(outputs=[file_data])
+
+    rv_post = post_simulation(client, simulation_data)
+    assert rv_post.status_code == 200
+
+    rv = client.get(f"/v1.2/file/download/{file_data.uuid.hex}", headers=HEADERS)
+    assert rv.status_code == 200
+    assert rv.mimetype == "text/plain"
+    assert rv.data == b"simulation output\n"
+    rv.close()
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_save_chunked_file_uncompressed(tmp_path):
+    """Test uncompressed chunks are written at their offset."""
+    path = tmp_path / "data.bin"
+    for index, chunk in enumerate([b"abcd", b"efgh", b"ij"]):
+        _save_chunked_file(
+            FileStorage(io.BytesIO(chunk), filename="data.bin"),
+            {"chunk_size": 4, "chunk": index},
+            path,
+            compressed=False,
+        )
+    assert path.read_bytes() == b"abcdefghij"
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_save_chunked_file_truncates_on_last_chunk(tmp_path):
+    """Test the last chunk trims preallocated space and data from older uploads."""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789abcdef")
+    for index, chunk in reversed(list(enumerate([b"abcd", b"ef"]))):
+        _save_chunked_file(
+            FileStorage(io.BytesIO(gzip.compress(chunk)), filename="data.bin"),
+            {"chunk_size": 4, "chunk": index, "num_chunks": 2},
+            path,
+        )
+    assert path.read_bytes() == b"abcdef"
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_list_models_iterate_over_items():
+    """Test the list models iterate over their items like the lists they wrap."""
+    files = [generate_simulation_file(), generate_simulation_file()]
+    file_list = FileDataList(files)
+    assert list(file_list) == files
+    assert file_list[1] == files[1]
+
+    metadata = MetadataDataList.model_validate({"a": 1, "b": "two"})
+    assert [(m.element, m.value) for m in metadata] == [("a", 1), ("b", "two")]
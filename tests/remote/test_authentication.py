@@ -1,3 +1,4 @@
+import datetime
 import importlib
 from typing import ClassVar
 from unittest import mock
@@ -8,10 +9,22 @@ from simdb.config import Config
 
 has_easyad = importlib.util.find_spec("easyad") is not None
 has_flask = importlib.util.find_spec("flask") is not None
+has_ldap = importlib.util.find_spec("ldap") is not None
 if has_flask:
+    import jwt
     from flask import Flask
 
-    from simdb.remote.core.auth import User, check_auth, check_role
+    from simdb.remote.core.auth import (
+        AuthenticationError,
+        TokenAuthenticator,
+        User,
+        check_auth,
+        check_role,
+    )
+if has_flask and has_ldap:
+    import ldap
+
+    from simdb.remote.core.auth.ldap import _drop_query_connection, _query_connection
 
 
 @mock.patch("simdb.config.Config.get_option")
@@ -83,3 +96,112 @@ def test_check_auth(get_option, easy_ad):
     request.headers = {"Authorization": ""}
     ok = check_auth(config, request)
     assert not ok
+
+
+def _token_request(payload):
+    token = jwt.encode(payload, "secret", algorithm="HS256")
+
+    class request:
+        headers: ClassVar[dict] = {"Authorization": f"JWT-Token {token}"}
+
+    return request
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+@pytest.mark.parametrize("email", ["user@email.com", None])
+def test_token_authenticate(email):
+    app = Flask("test")
+    app.config["SECRET_KEY"] = "secret"
+    now = datetime.datetime.now(datetime.timezone.utc)
+    request = _token_request(
+        {"exp": now + datetime.timedelta(days=1), "sub": "user", "email": email}
+    )
+    with app.app_context():
+        user = TokenAuthenticator().authenticate(Config(), request)
+    assert user == User("user", email)
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_token_authenticate_expired():
+    app = Flask("test")
+    app.config["SECRET_KEY"] = "secret"
+    now = datetime.datetime.now(datetime.timezone.utc)
+    request = _token_request(
+        {"exp": now - datetime.timedelta(days=1), "sub": "user", "email": None}
+    )
+    with app.app_context(), pytest.raises(AuthenticationError, match="expired"):
+        TokenAuthenticator().authenticate(Config(), request)
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_token_authenticate_missing_expiry():
+    app = Flask("test")
+    app.config["SECRET_KEY"] = "secret"
+    request = _token_request({"sub": "user", "email": None})
+    with app.app_context(), pytest.raises(AuthenticationError, match="Invalid"):
+        TokenAuthenticator().authenticate(Config(), request)
+
+
+@mock.patch("simdb.remote.core.auth.TokenAuthenticator.authenticate")
+@mock.patch("simdb.config.Config.get_option")
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_check_auth_without_credentials(get_option, token_authenticate):
+    config = Config()
+    get_option.side_effect = lambda name, default=None: {
+        "authentication.type": "token",
+    }.get(name, default)
+
+    class request:
+        authorization = None
+        headers: ClassVar[dict] = {}
+
+    assert check_auth(config, request) is None
+    token_authenticate.assert_not_called()
+
+
+@mock.patch("simdb.config.Config.get_option")
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_check_auth_admin(get_option):
+    config = Config()
+    get_option.side_effect = lambda name, default=None: {
+        "server.admin_password": "abc123",
+    }.get(name, default)
+
+    class request:
+        class authorization:
+            username = "admin"
+            password = "abc123"
+
+        headers: ClassVar[dict] = {}
+
+    assert check_auth(config, request) == User("admin", None)
+    request.authorization.password = "abc1234"
+    with pytest.raises(AuthenticationError):
+        check_auth(config, request)
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+@pytest.mark.parametrize("header", ["", "Basic abc", "JWT-Token a b"])
+def test_token_authenticate_malformed_header(header):
+    app = Flask("test")
+    app.config["SECRET_KEY"] = "secret"
+
+    class request:
+        headers: ClassVar[dict] = {"Authorization": header}
+
+    with app.app_context(), pytest.raises(AuthenticationError, match="Invalid"):
+        TokenAuthenticator().authenticate(Config(), request)
+
+
+@pytest.mark.skipif(not has_ldap, reason="requires ldap library")
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_ldap_query_connection_unbinds_replaced_connection():
+    first, second = mock.Mock(), mock.Mock()
+    first.unbind_s.side_effect = ldap.SERVER_DOWN()
+    with mock.patch("ldap.initialize", side_effect=[first, second]):
+        assert _query_connection("ldap://one", "query", "secret") is first
+        assert _query_connection("ldap://one", "query", "secret") is first
+        assert _query_connection("ldap://two", "query", "secret") is second
+    first.unbind_s.assert_called_once_with()
+    _drop_query_connection()
+    second.unbind_s.assert_called_once_with()
@@ -0,0 +1,32 @@
+import importlib
+
+import pytest
+
+has_flask = importlib.util.find_spec("flask") is not None
+if has_flask:
+    from flask import Flask
+
+    from simdb.remote.core.cache import cache_key
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_cache_key_is_independent_of_header_order():
+    app = Flask(__name__)
+    with app.test_request_context(
+        "/simulations", headers=[("simdb-page", "2"), ("simdb-result-limit", "10")]
+    ):
+        key1 = cache_key()
+    with app.test_request_context(
+        "/simulations",
+        headers=[("Accept", "*/*"), ("simdb-result-limit", "10"), ("simdb-page", "2")],
+    ):
+        key2 = cache_key()
+    assert key1 == key2
+    assert key1 == "http://localhost/simulations?simdb-page:2&simdb-result-limit:10"
+
+
+@pytest.mark.skipif(not has_flask, reason="requires flask library")
+def test_cache_key_without_simdb_headers():
+    app = Flask(__name__)
+    with app.test_request_context("/simulations", headers=[("Accept", "*/*")]):
+        assert cache_key() == "http://localhost/simulations"
@@ -0,0 +1,39 @@
+import hashlib
+
+import pytest
+
+from simdb.checksum import CHUNK_SIZE, sha1_checksum
+from simdb.uri import URI
+
+
+@pytest.mark.parametrize("size", [0, 10, CHUNK_SIZE, CHUNK_SIZE * 2 + 7])
+def test_sha1_checksum(tmp_path, size):
+    data = bytes(i % 251 for i in range(size))
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    checksum = sha1_checksum(URI(scheme="file", path=path))
+    assert checksum == hashlib.sha1(data).hexdigest()
+
+
+def test_sha1_checksum_without_file_digest(tmp_path, monkeypatch):
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    data = bytes(i % 251 for i in range(CHUNK_SIZE + 7))
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    checksum = sha1_checksum(URI(scheme="file", path=path))
+    assert checksum == hashlib.sha1(data).hexdigest()
+
+
+def test_sha1_checksum_invalid_scheme(tmp_path):
+    with pytest.raises(ValueError):
+        sha1_checksum(URI(f"imas:hdf5?path={tmp_path}"))
+
+
+def test_sha1_checksum_missing_file(tmp_path):
+    with pytest.raises(ValueError):
+        sha1_checksum(URI(scheme="file", path=tmp_path / "missing.bin"))
+
+
+def test_sha1_checksum_directory(tmp_path):
+    with pytest.raises(ValueError):
+        sha1_checksum(URI(scheme="file", path=tmp_path))
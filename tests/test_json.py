@@ -0,0 +1,48 @@
+import base64
+import json
+import uuid
+
+import numpy as np
+import pytest
+
+from simdb.json import CustomDecoder, CustomEncoder
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(10, dtype=np.float64),
+        np.arange(10, dtype=np.int32)[::2],
+        np.array([], dtype=np.float32),
+    ],
+)
+def test_ndarray_round_trip(array):
+    encoded = json.dumps({"data": array}, cls=CustomEncoder)
+    decoded = json.loads(encoded, cls=CustomDecoder)
+    assert decoded["data"].dtype == array.dtype
+    np.testing.assert_array_equal(decoded["data"], array)
+
+
+def test_ndarray_decode_with_line_breaks():
+    array = np.arange(100, dtype=np.float64)
+    # base64.encodebytes wraps its output every 76 characters
+    encoded = {
+        "_type": "numpy.ndarray",
+        "dtype": array.dtype.name,
+        "bytes": base64.encodebytes(array.tobytes()).decode(),
+    }
+    assert "\n" in encoded["bytes"]
+    decoded = json.loads(json.dumps(encoded), cls=CustomDecoder)
+    np.testing.assert_array_equal(decoded, array)
+
+
+def test_uuid_round_trip():
+    value = uuid.uuid4()
+    encoded = json.dumps({"uuid": value}, cls=CustomEncoder)
+    assert json.loads(encoded) == {"uuid": {"_type": "uuid.UUID", "hex": value.hex}}
+    assert json.loads(encoded, cls=CustomDecoder) == {"uuid": value}
+
+
+def test_unknown_type():
+    with pytest.raises(ValueError):
+        json.loads('{"_type": "unknown"}', cls=CustomDecoder)